@@ -14,7 +14,7 @@ from phokimo.src.additional_functions import expfitting, product_ratio, dict_gen
 from phokimo.src.ode_builder import construct_ode
 from phokimo.src.rate_constants import RateCalculator
 from phokimo.src.terachem_values import Reactions, State_Values
-from phokimo.src.toml_reader import TomlReader
+from phokimo.src.toml_reader import read_toml
 from tcgm_lib.convert.converter import energy_unit
 
 def main() -> None:
@@ -28,15 +28,16 @@ def main() -> None:
     toml_file = sys.argv[1]
     current_dir = os.getcwd()
     toml_file_path = os.path.join(current_dir, toml_file)
-    toml_data = TomlReader(toml_file_path)
+    toml_data = read_toml(toml_file_path)
 
-    num_states = toml_data.num_states()
-    visualize_state_list_name = toml_data.visualize_state_list_name()
+    num_states = toml_data.len_states
+    visualize_state_list_name = toml_data.vis_name_list
     state_dict = toml_data.name_to_num
-    start_conc = toml_data.initial_conc()
+    start_conc = toml_data.initial_concs
 
-    state_data = State_Values(toml_data)
+    state_data = State_Values(toml_data, cache_file="phokimo_energy_cache.json")
     state_list_energy = state_data.state_relative_list_energy()
+    state_data.save_cache()
 
     rate_formula = RateCalculator()
     reactions = Reactions(toml_data, rate_formula, state_list_energy)
@@ -65,16 +66,16 @@ def main() -> None:
     dEs = reactions.dEs(state_list_energy)
     rates = reactions.rates(state_list_energy)
 
-    table = toml_data.reactions_num
+    table = toml_data.reactions_arr
     table_name = toml_data.reactions_vis
 
-    duration = toml_data.duration()
+    duration = toml_data.time_duration
     spacing = 100000
     time = np.linspace(0, duration, spacing)
     conc = np.zeros((spacing, num_states))
     func = partial(construct_ode, table = table, rates=rates)
     conc = odeint(func, start_conc, time)
-    x_axis = [i * 10 ** (15) for i in time] #fs
+    x_axis = time * 1e15 #fs
 
     plt.plot(x_axis, conc)
     plt.legend(visualize_state_list_name)
@@ -4,10 +4,8 @@ from __future__ import annotations
 
 import os
 import sys
-import numpy as np
 import graphviz as gp
-from phokimo.src.toml_reader import TomlReader
-from collections import Counter
+from phokimo.src.toml_reader import read_toml
 
 def main():
     """ A tool to build graph diagram that represents the reaction mechanism """
@@ -19,7 +17,7 @@ def main():
     toml_file = sys.argv[1]
     current_dir = os.getcwd()
     toml_file_path = os.path.join(current_dir, toml_file)
-    toml_data = TomlReader(toml_file_path)
+    toml_data = read_toml(toml_file_path)
 
     name_to_num = toml_data.name_to_num
     visualize_name = toml_data.vis_name_list
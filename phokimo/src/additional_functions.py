@@ -2,14 +2,14 @@
 
 from __future__ import annotations
 
+import warnings
+from collections.abc import Callable
+
 import matplotlib.pyplot as plt
-import networkx as nx
 import numpy as np
-import graphviz as gp
-from graphviz import Source
-from scipy.optimize import curve_fit
+from scipy.optimize import OptimizeResult, least_squares
+from scipy.sparse import block_diag, csr_matrix
 import toml
-import os
 
 def product_ratio(spacing: int, conc: np.ndarray, product_list_name_vis: list[str], product_list_num: list[int]) -> None:
     """Calculate the product ratio and store in dictionary to generate TOML file.
@@ -44,6 +44,136 @@ def product_ratio(spacing: int, conc: np.ndarray, product_list_name_vis: list[st
     frac_dict_return["Product ratios %"] = frac_dict
     return frac_dict_return
 
+def _exponential_func(x: np.ndarray, a: float, k: float, c: float) -> np.ndarray:
+    """Exponential decay a * exp(k * x) + c used for the fitting of the concentrations.
+
+    Args:
+        x (np.ndarray): time
+        a (float): amplitude
+        k (float): rate of the decay
+        c (float): offset
+
+    Returns:
+        np.ndarray: values of the exponential
+    """
+    return a * np.exp(k * x) + c
+
+
+def _trace_residuals(params: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Residuals of the exponential fit of one concentration trace.
+
+    Args:
+        params (np.ndarray): amplitude, rate and offset of the exponential
+        x (np.ndarray): time
+        y (np.ndarray): concentration trace
+
+    Returns:
+        np.ndarray: residuals per time step
+    """
+    return _exponential_func(x, *params) - y
+
+
+def _trace_jac(params: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:  # noQA: ARG001
+    """Jacobian of the residuals of one concentration trace.
+
+    Args:
+        params (np.ndarray): amplitude, rate and offset of the exponential
+        x (np.ndarray): time
+        y (np.ndarray): concentration trace, unused but required by least_squares
+
+    Returns:
+        np.ndarray: (time steps) x 3 Jacobian
+    """
+    a, k, _ = params
+    e = np.exp(k * x)
+    return np.stack([e, a * x * e, np.ones_like(x)], axis=1)
+
+
+def _joint_residuals(params: np.ndarray, x: np.ndarray, y_traces: np.ndarray) -> np.ndarray:
+    """Residuals of the exponential fits of all concentration traces on the shared time axis.
+
+    Args:
+        params (np.ndarray): amplitude, rate and offset of every trace, flattened
+        x (np.ndarray): time
+        y_traces (np.ndarray): concentration traces as (traces) x (time steps) array
+
+    Returns:
+        np.ndarray: residuals of all traces, flattened
+    """
+    a, k, c = params.reshape(len(y_traces), 3).T
+    return (a[:, None] * np.exp(k[:, None] * x) + c[:, None] - y_traces).ravel()
+
+
+def _joint_jac(params: np.ndarray, x: np.ndarray, y_traces: np.ndarray) -> csr_matrix:
+    """Sparse Jacobian of the joint residuals, one independent block per trace.
+
+    Args:
+        params (np.ndarray): amplitude, rate and offset of every trace, flattened
+        x (np.ndarray): time
+        y_traces (np.ndarray): concentration traces as (traces) x (time steps) array
+
+    Returns:
+        csr_matrix: block diagonal Jacobian
+    """
+    blocks = [_trace_jac(trace_params, x, y) for trace_params, y in zip(params.reshape(len(y_traces), 3), y_traces)]
+    return block_diag(blocks, format="csr")
+
+
+def _least_squares_fit(
+    residuals: Callable[..., np.ndarray],
+    jac: Callable[..., np.ndarray | csr_matrix],
+    p0: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+) -> OptimizeResult:
+    """Fit exponentials with the settings shared by the joint and the per-trace fit.
+
+    Args:
+        residuals (Callable[..., np.ndarray]): residual function called as residuals(params, x, y)
+        jac (Callable[..., np.ndarray | csr_matrix]): Jacobian of the residual function with the same signature
+        p0 (np.ndarray): initial parameters
+        x (np.ndarray): time
+        y (np.ndarray): concentration trace(s)
+
+    Returns:
+        OptimizeResult: result of the least-squares fit
+    """
+    return least_squares(residuals, p0, jac=jac, args=(x, y), method="trf", x_scale="jac", max_nfev=2000)
+
+
+def _fit_traces(x: np.ndarray, y_traces: np.ndarray, labels: list[str]) -> tuple[np.ndarray, list[bool]]:
+    """Fit an exponential to every concentration trace.
+
+    All traces share the same time axis, so they are fitted jointly in one least-squares problem.
+    If the joint fit does not converge, the traces are fitted one by one,
+    so a trace that does not converge only loses its own time constant.
+
+    Args:
+        x (np.ndarray): time
+        y_traces (np.ndarray): concentration traces as (traces) x (time steps) array
+        labels (list[str]): label of every trace
+
+    Returns:
+        tuple[np.ndarray, list[bool]]: (traces) x 3 array of amplitude, rate and offset, and convergence per trace
+    """
+    # decay within the simulated window
+    p0 = np.column_stack([y_traces[:, 0] - y_traces[:, -1], np.full(len(y_traces), -5.0 / x[-1]), y_traces[:, -1]])
+    fit = _least_squares_fit(_joint_residuals, _joint_jac, p0.ravel(), x, y_traces)
+    if fit.success:
+        return fit.x.reshape(p0.shape), [True] * len(y_traces)
+
+    warnings.warn(f"Joint exponential fit did not converge, fitting the traces one by one: {fit.message}", stacklevel=2)
+    popt = np.empty_like(p0)
+    converged = []
+    for i, (y, label) in enumerate(zip(y_traces, labels)):
+        trace_fit = _least_squares_fit(_trace_residuals, _trace_jac, p0[i], x, y)
+        if not trace_fit.success:
+            warnings.warn(f"Optimal parameters not found for {label}: {trace_fit.message}", stacklevel=2)
+        popt[i] = trace_fit.x
+        converged.append(trace_fit.success)
+    return popt, converged
+
+
 def expfitting(time: np.ndarray, x_axis: np.ndarray, state_dict: dict, spin_list_dict: dict, conc: np.ndarray) -> dict:
     """Execute exponential fitting per spin state to calculate time constant.
     Store values as dictionary to generate TOML file.
@@ -58,9 +188,6 @@ def expfitting(time: np.ndarray, x_axis: np.ndarray, state_dict: dict, spin_list
     Returns:
         dict: dictionary of values related to the exponential to generate TOML file
     """
-    def exponential_func(x, a, k, c):
-        return a * np.exp(k * x) + c
-    
     x = time
     spacing = len(time)
     y_list =  np.zeros((spacing, len(spin_list_dict))) # time * label
@@ -80,10 +207,8 @@ def expfitting(time: np.ndarray, x_axis: np.ndarray, state_dict: dict, spin_list
         label_list[counter] = label
         expfitting_result[label] = {}
 
-        for state in spin_list_dict[spin_pair]:
-            state_num = state_dict[state]
-            for t in range(len(time)):
-                y_list[t][counter] += conc[t][state_num]
+        state_nums = [state_dict[state] for state in spin_list_dict[spin_pair]]
+        y_list[:, counter] = conc[:, state_nums].sum(axis=1)
         counter += 1
     plt.plot(x_axis, y_list)
     plt.legend(label_list)
@@ -95,25 +220,24 @@ def expfitting(time: np.ndarray, x_axis: np.ndarray, state_dict: dict, spin_list
     plt.clf()
 
     y_transpose = np.transpose(y_list) # label * time
+    n_spins = len(spin_list_dict)
+    popt, converged = _fit_traces(x, y_transpose, label_list)
 
-    for i in range(len(spin_list_dict)):
+    for i in range(n_spins):
         y = y_transpose[i]
-        try:
-            popt, pcov = curve_fit(exponential_func, x, y)
-            a, k, c = popt
+        label = label_list[i]
+        if converged[i]:
+            a, k, c = popt[i]
             time_constant = 1 / abs(k) * 10 ** (15) #fs
-            label = label_list[i]
             expfitting_result[label]['Time constant [fs]'] = time_constant
             print("Time constant ", label, " : ", np.round(1 / abs(k) * 10 ** (15), 4), "fs")
-            y_fit = exponential_func(x, a, k, c)
+            y_fit = _exponential_func(x, a, k, c)
             y_fit_list.append(y_fit)
-        except RuntimeError as e:
-            print("Optimal parameters not found:", e)
         expfitting_result[label]['Fraction'] = y[len(time)-1]
         print(label, ": ", np.round(y[len(time)-1], 4) * 100, "%")
         
     y_fit_transpose = np.transpose(np.array(y_fit_list))
-    fit_label_list = [x + '_fit' for x in label_list]
+    fit_label_list = [label + '_fit' for label, success in zip(label_list, converged) if success]
     
     plt.plot(x_axis, y_list, label = label_list)
     plt.plot(x_axis, y_fit_transpose, label = fit_label_list)
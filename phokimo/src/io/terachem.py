@@ -29,6 +29,8 @@ class TeraChemOutputReader:
             self.lines: list[str] = file.readlines()
         file.close()
 
+        self._latest_str_idx: dict[str, int] = {}
+
         assert self._check_finish(), f"{fname} did not finish!"
 
     def _check_finish(self) -> bool:
@@ -45,7 +47,7 @@ class TeraChemOutputReader:
 
         max_lines = min(200, len(self.lines))
 
-        for i in range(1, max_lines):
+        for i in range(1, max_lines + 1):
             if substring in self.lines[-i]:
                 finished = True
                 break
@@ -66,7 +68,7 @@ class TeraChemOutputReader:
 
         max_lines = min(200, len(self.lines))
 
-        for i in range(1, max_lines):
+        for i in range(1, max_lines + 1):
             if substring in self.lines[-i]:
                 converged = True
                 break
@@ -77,6 +79,7 @@ class TeraChemOutputReader:
         """Tool to search a substring in the lines of the output.
 
         This tool starts at the end of the file and stops at the first entry where the substring is in.
+        The resulting line index is cached, so every block of the output is only searched once.
 
         Args:
             substring (str): _description_
@@ -84,13 +87,37 @@ class TeraChemOutputReader:
         Returns:
             int: _description_
         """
+        if substring in self._latest_str_idx:
+            return self._latest_str_idx[substring]
+
         j = 0
         for i in reversed(range(len(self.lines))):
             if substring in self.lines[i]:
                 j = i
                 break
+        self._latest_str_idx[substring] = j
         return j
 
+    def _block_lines(self, start: int, max_rows: int) -> list[str]:
+        """Collect the lines of a table block in the output.
+
+        The block starts at the given line and ends at the first empty line or after max_rows lines.
+        The lines are returned unparsed so that the whole block can be converted to numbers at once.
+
+        Args:
+            start (int): index of the first line of the block
+            max_rows (int): maximal number of lines in the block
+
+        Returns:
+            list[str]: lines of the block
+        """
+        block = []
+        for line in self.lines[start : start + max_rows]:
+            if line == "\n":
+                break
+            block.append(line)
+        return block
+
     def energy(self) -> float:
         """Extract the final energy from the output.
 
@@ -146,21 +173,12 @@ class TeraChemOutputReader:
             np.ndarray: State dipole moments
         """
         substring = " state dipole moments:"
-        state_dipole_moments = []
 
         j = self._search_latest_str(substring)
 
-        for idx in range(4, max_roots + 4):
-            if self.lines[j + idx] != "\n":
-                temp: list = self.lines[j + idx].split()
-                temp.pop(0)
-                temp.pop(-1)
-                temp = [float(val) for val in temp]
-                state_dipole_moments.append(temp)
-            else:
-                break
+        block = self._block_lines(j + 4, max_roots)
 
-        return np.array(state_dipole_moments)
+        return np.array([line.split()[1:-1] for line in block], dtype=np.float64)
 
     def transition_dipole_moment(self, max_roots: int = 996) -> pd.DataFrame:
         """Extract transition dipole moments.
@@ -176,24 +194,21 @@ class TeraChemOutputReader:
         """
         substring = "Transition dipole moments "
 
-        state_dipole_moments = []
-
         j = self._search_latest_str(substring)
 
-        for idx in range(4, max_roots + 4):
-            if self.lines[j + idx] != "\n":
-                temp: list = self.lines[j + idx].split()
-                temp.pop(1)
-                temp[:2] = [int(val) for val in temp[:2]]
-                temp[2:] = [float(val) for val in temp[2:]]
-                state_dipole_moments.append(temp)
-            else:
-                break
+        block = self._block_lines(j + 4, max_roots)
+
+        # the second column only holds the separator between the initial and final state
+        state_dipole_moments = np.array(
+            [[tokens[0], *tokens[2:]] for tokens in map(str.split, block)],
+            dtype=np.float64,
+        ).reshape(-1, 6)
 
-        return pd.DataFrame(
+        state_dipole_moments_df = pd.DataFrame(
             state_dipole_moments,
             columns=["init", "final", "x", "y", "z", "norm"],
         )
+        return state_dipole_moments_df.astype({"init": int, "final": int})
 
     def scf_iterations(self, max_steps: int = 101) -> pd.DataFrame:
         """Returns the last scf iteration.
@@ -207,18 +222,21 @@ class TeraChemOutputReader:
         line_idx = self._search_latest_str(
             "                      *** Start SCF Iterations ***",
         )
-        scf_information = []
+        columns = 8
+        scf_information = np.empty((max_steps * 2, columns))
+        row = 0
         for idx in range(line_idx + 6, line_idx + max_steps * 2):
             if not ("Reached max number of SCF iterations" in self.lines[idx] or "-" * 20 in self.lines[idx]):
                 splitted_line = self.lines[idx].split()
 
                 if splitted_line[1].isdigit():
-                    scf_information.append(map(float, splitted_line[1:]))
+                    scf_information[row] = np.array(splitted_line[1 : columns + 1], dtype=np.float64)
+                    row += 1
             else:
                 break
 
         scf_information_df = pd.DataFrame(
-            scf_information,
+            scf_information[:row],
             columns=[
                 "Iter",
                 "DIIS Error",
@@ -2,11 +2,7 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
-
-if TYPE_CHECKING:
-    import numpy as np
-    from scipy.integrate import odeint
+import numpy as np
 
 
 def hard_coded_ode(c: np.ndarray, t: np.ndarray, k: np.ndarray) -> tuple[np.ndarray, ...]:  # noQA: ARG001
@@ -29,23 +25,24 @@ def hard_coded_ode(c: np.ndarray, t: np.ndarray, k: np.ndarray) -> tuple[np.ndar
     return c0, c1
 
 
-def construct_ode(concentration: np.ndarray, t: np.ndarray, table: list[tuple], rates: np.ndarray) -> tuple[float, ...]:  # noQA: ARG001
+def construct_ode(
+    concentration: np.ndarray,
+    t: np.ndarray,  # noQA: ARG001
+    table: tuple[np.ndarray, np.ndarray],
+    rates: np.ndarray,
+) -> np.ndarray:
     """A tool to automatically construct ODEs.
 
     Args:
         concentration (np.ndarray): starting concentration
         t (np.ndarray): time
-        table (list[tuple]): table with information of elementary reactions
+        table (tuple[np.ndarray, np.ndarray]): numbering of the initial and final states of the elementary reactions
         rates (np.ndarray): reaction rates as N x N adjacency matrix. N: number of states.
 
     Returns:
-        tuple: concentration profile for ODEs.
+        np.ndarray: concentration profile for ODEs.
     """
-    odes = [0.0 for _ in concentration]
-
-    for reaction in table:
-        init = reaction[0]
-        final = reaction[1]
-        odes[init] -= rates[init, final] * concentration[init]
-        odes[final] += rates[init, final] * concentration[init]
-    return tuple(odes)
\ No newline at end of file
+    init, final = table
+    flux = rates[init, final] * concentration[init]
+    n_states = len(concentration)
+    return np.bincount(final, weights=flux, minlength=n_states) - np.bincount(init, weights=flux, minlength=n_states)
@@ -15,6 +15,9 @@ ELEC_MASS = constants.electron_mass
 VAC_PERM = constants.epsilon_0
 SPEED_OF_LIGHT = constants.speed_of_light
 PI = np.pi
+KB_OVER_H = K_BOLTZ / H_PLANCK
+INV_R = 1.0 / R_GAS
+EINSTEIN_PREFACTOR = 2 * PI * ELEM_CHRG**2 / (VAC_PERM * ELEC_MASS)
 
 
 class RelaxationTheory(ABC):
@@ -27,21 +30,25 @@ class RelaxationTheory(ABC):
     @abstractmethod
     def compute_rate(
         self,
-        dE: float,
-        n_modes: float,
-        n_atoms: float,
-        T: float = 298.15,
-    ) -> float:
+        dE: float | np.ndarray,
+        n_modes: float | np.ndarray,
+        n_atoms: float | np.ndarray,
+        T: float | np.ndarray = 298.15,
+    ) -> float | np.ndarray:
         """Abstract method for a relaxtion rate.
 
+        Implementations must accept arrays for all arguments,
+        broadcast them against each other and return an array of rates in that case.
+        Scalar arguments may still be given and return a single rate.
+
         Args:
-            dE (float): Energy difference
-            n_modes (float): number of involved normal modes
-            n_atoms (float): number of atoms
-            T (float, optional): temperature. Defaults to 298.15.
+            dE (float | np.ndarray): Energy difference
+            n_modes (float | np.ndarray): number of involved normal modes
+            n_atoms (float | np.ndarray): number of atoms
+            T (float | np.ndarray, optional): temperature. Defaults to 298.15.
 
         Returns:
-            float: _description_
+            float | np.ndarray: _description_
         """
 
 
@@ -83,19 +90,23 @@ class ReactionTheory(ABC):
     @abstractmethod
     def compute_rate(
         self,
-        dG: float,
-        T: float = 298.15,
-        kappa: float = 1,
-    ) -> float:
+        dG: float | np.ndarray,
+        T: float | np.ndarray = 298.15,
+        kappa: float | np.ndarray = 1,
+    ) -> float | np.ndarray:
         """Abstract method for the computation of reaction rates.
 
+        Implementations must accept arrays for all arguments,
+        broadcast them against each other and return an array of rates in that case.
+        Scalar arguments may still be given and return a single rate.
+
         Args:
-            dG (float): _description_
-            T (float, optional): _description_. Defaults to 298.15.
-            kappa (float, optional): _description_. Defaults to 1.
+            dG (float | np.ndarray): _description_
+            T (float | np.ndarray, optional): _description_. Defaults to 298.15.
+            kappa (float | np.ndarray, optional): _description_. Defaults to 1.
 
         Returns:
-            float: reaction rate
+            float | np.ndarray: reaction rate
         """
 
 
@@ -104,10 +115,10 @@ class EyringEquation(ReactionTheory):
 
     def compute_rate(
         self,
-        dG: float,
-        T: float = 298.15,
-        kappa: float = 1,
-    ) -> float:
+        dG: float | np.ndarray,
+        T: float | np.ndarray = 298.15,
+        kappa: float | np.ndarray = 1,
+    ) -> float | np.ndarray:
         """Compute the rate constant using the Eyring equation.
 
         Eyring: https://doi.org/10.1039/TF9353100875 \n
@@ -116,15 +127,17 @@ class EyringEquation(ReactionTheory):
         .. math::
             k = \\kappa \\cdot \\dfrac{k_\\mathrm{b}T}{h}\\exp-\\dfrac{\\Delta G}{RT}
 
+        All arguments may also be given as arrays to compute the rates of several states at once.
+
         Args:
-            dG (float): Gibbs energy of activation in J/mol
-            T (float, optional): Temperature. Defaults to 298.15.
-            kappa (float, optional): transimission coefficient. Defaults to 1.
+            dG (float | np.ndarray): Gibbs energy of activation in J/mol
+            T (float | np.ndarray, optional): Temperature. Defaults to 298.15.
+            kappa (float | np.ndarray, optional): transimission coefficient. Defaults to 1.
 
         Returns:
-            float: Eyring eq. derived rate constant
+            float | np.ndarray: Eyring eq. derived rate constant
         """
-        return kappa * K_BOLTZ * T / H_PLANCK * np.exp(-dG / (R_GAS * T))
+        return kappa * KB_OVER_H * T * np.exp(-dG * INV_R / T)
 
 
 class EinsteinCoeffientA12(EmissionTheory):
@@ -146,6 +159,8 @@ class EinsteinCoeffientA12(EmissionTheory):
         .. math::
             A_{21} = \\dfrac{g_1}{g_2} \\cdot \\dfrac{\\pi \\nu  e^2 }{\\epsilon_0 m_\\mathrm{el}}
 
+        All arguments may also be given as arrays to compute the rates of several states at once.
+
         Args:
             nu (float): Excitation energy in nm
             f12 (float): Oscillator strength
@@ -155,8 +170,7 @@ class EinsteinCoeffientA12(EmissionTheory):
         Returns:
             float: Spontaneous emission coefficient
         """
-        prefactor = 2 * PI * nu**2 * ELEM_CHRG**2 / (VAC_PERM * ELEC_MASS)
-        return prefactor * g1 / g2 * f12
+        return EINSTEIN_PREFACTOR * (nu * nu) * (g1 / g2) * f12
 
 
 class AdhocRelaxation(RelaxationTheory):
@@ -164,11 +178,11 @@ class AdhocRelaxation(RelaxationTheory):
 
     def compute_rate(
         self,
-        dE: float,
-        n_modes: float,
-        n_atoms: float,
-        T: float = 298.15,
-    ) -> float:
+        dE: float | np.ndarray,
+        n_modes: float | np.ndarray,
+        n_atoms: float | np.ndarray,
+        T: float | np.ndarray = 298.15,
+    ) -> float | np.ndarray:
         """Ad hoc ansatz for the approximation of the relaxation of structure to the ground state.
 
         This is a self developed approach for the description of the relaxation of vibronically excited states.
@@ -180,16 +194,19 @@ class AdhocRelaxation(RelaxationTheory):
             k_\\mathrm{relax} = \\dfrac{k_\\mathrm{B}T}{h}
             \\exp\\dfrac{n\\Delta\\epsilon_\\mathrm{init}^\\mathrm{final}}{RT}
 
+        All arguments may also be given as arrays to compute the rates of several states at once.
+
         Args:
-            dE (float): Energy difference between excited and ground structure in J/mol.
-            n_modes (float): Number of normal modes involved in the relaxation.
-            T (float): Temperature. Defaults to 298.15.
-            n_atoms (float): Number of atoms of the structure
+            dE (float | np.ndarray): Energy difference between excited and ground structure in J/mol.
+            n_modes (float | np.ndarray): Number of normal modes involved in the relaxation.
+            T (float | np.ndarray): Temperature. Defaults to 298.15.
+            n_atoms (float | np.ndarray): Number of atoms of the structure
 
         Returns:
-            float: Rate of relaxation.
+            float | np.ndarray: Rate of relaxation.
         """
-        return K_BOLTZ * T / H_PLANCK * np.exp(-(n_modes * dE) / ((3 * n_atoms - 6) * R_GAS * T))
+        return KB_OVER_H * T * np.exp(-(n_modes * dE) * INV_R / ((3 * n_atoms - 6) * T))
+
 
 class RateCalculator:
     """Interface to define the varying theories that should be used for the computation of the rates."""
@@ -1,26 +1,116 @@
 from __future__ import annotations
 
+import json
+import mmap
 import os
+import tempfile
+from functools import cached_property, lru_cache
 
 import numpy as np
 
 from phokimo.src.io.terachem import TeraChemOutputReader
+from phokimo.src.rate_constants import INV_R
 from scipy import constants
-from tcgm_lib.convert.converter import energy_unit
+
+HARTREE_TO_JMOL = constants.physical_constants["Hartree energy"][0] * constants.Avogadro
+
+
+def _file_version(file_path: str) -> tuple[int, int]:
+    """Get the version of a file, used to invalidate cached values of changed files.
+
+    Args:
+        file_path (str): path of the file
+
+    Returns:
+        tuple[int, int]: modification time (ns) and size of the file
+    """
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=128)
+def _read_ci_energy(file_path: str, version: tuple[int, int], max_roots: int) -> np.ndarray:  # noQA: ARG001
+    """Read the configurational interaction energies of a TeraChem output once per version of the file.
+
+    Args:
+        file_path (str): path of the TeraChem output
+        version (tuple[int, int]): version of the file from _file_version, a changed file is read again
+        max_roots (int): Number of roots to extract from
+
+    Returns:
+        np.ndarray: energies (Eh)
+    """
+    return TeraChemOutputReader(file_path).ci_energy(max_roots)[0]
+
+
+@lru_cache(maxsize=128)
+def _read_final_energy(file_path: str, version: tuple[int, int]) -> float:  # noQA: ARG001
+    """Read the final energy of a ground state TeraChem output once per version of the file.
+
+    The file is memory mapped and searched from the end, since TeraChem writes the final energy near the end.
+    If the calculation did not finish or has no final energy, AssertionError will be raised.
+
+    Args:
+        file_path (str): path of the TeraChem output
+        version (tuple[int, int]): version of the file from _file_version, a changed file is read again
+
+    Returns:
+        float: energy (Eh)
+    """
+    with open(file_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        assert mm.rfind(b" Job finished:") != -1, f"{file_path} did not finish!"
+        idx = mm.rfind(b"FINAL ENERGY:")
+        assert idx != -1, f"{file_path} has no final energy!"
+        mm.seek(idx)
+        return float(mm.readline().split()[2])
 
 
 class State_Values:
-    def __init__(self, toml) -> None:
+    def __init__(self, toml, cache_file: str = None) -> None:
         """Extract data from terachem output based on the kinetic model.
 
         Reads given toml file for the kinetic modeling and extract energy values from terachem outputs.
+        If a cache file is given, the energies of the outputs are kept there across runs.
+        Each output keeps one entry with its modification time and size, so changed outputs are read again.
+        A cache file that cannot be read is ignored and the outputs are read again.
+        The cache file is only written by save_cache.
 
         Args:
             toml: TomlReader(toml_file_path) that reads toml file
+            cache_file (str): default setting is None, path of the json file that caches the output energies
         """
         self.toml = toml
-        self.hartree_array = self.state_relative_list_hartree()
-        self.jmol_array = self.state_relative_list_energy()
+        self._energy_cache: dict[tuple, float] = {}
+
+        self.cache_file = cache_file
+        self._output_cache: dict = {}
+        if cache_file is not None and os.path.exists(cache_file):
+            try:
+                with open(cache_file) as file:
+                    cached = json.load(file)
+            except (json.JSONDecodeError, OSError):
+                cached = {}
+            # entries of older cache layouts are dropped
+            if isinstance(cached, dict):
+                self._output_cache = {path: entries for path, entries in cached.items() if isinstance(entries, dict)}
+
+    @cached_property
+    def hartree_array(self) -> np.ndarray:
+        """Relative energies of the states, read from the outputs on first access.
+
+        Returns:
+            np.ndarray: array of energies relative to reference state (Eh)
+        """
+        return self.state_relative_list_hartree()
+
+    @cached_property
+    def jmol_array(self) -> np.ndarray:
+        """Relative energies of the states in J/mol, converted on first access.
+
+        Returns:
+            np.ndarray: array of energies relative to reference state (J/mol)
+        """
+        return self.state_relative_list_energy()
 
     def terachem_output(self, state: str, max_roots: int = 5, substate_name: str = None, ground: bool = False) -> float:
         """Get the energy value of target state.
@@ -34,47 +124,86 @@ class State_Values:
         Returns:
             float: energy (Eh)
         """
+        key = (state, max_roots, substate_name, ground)
+        if key in self._energy_cache:
+            return self._energy_cache[key]
+
         file_paths = self.toml.file_path
-        target_spin_state = self.toml.target_spin_state(state)
-        if self.toml.reference_state() == state:
+        if state == self.toml.ref_name:
             file_path = self.toml.ref_file_path(ground)
-            terachem = TeraChemOutputReader(file_path)
-            if not ground:
-                energy_tuple = terachem.ci_energy(max_roots)
-                energy_value = (energy_tuple[0][target_spin_state[0]] + energy_tuple[0][target_spin_state[1]]) / 2
-            else:
-                with open(file_path, 'r') as file:
-                    for line in file:
-                        if "FINAL ENERGY:" in line:
-                            energy_value = float(line.split()[2])
-                            break
-
+            excited = not ground
         elif substate_name == None:
             file_path = file_paths[state]
-            terachem = TeraChemOutputReader(file_path)
-            if self.toml.theory_level(state) == "excited":
-                energy_tuple = terachem.ci_energy(max_roots)
-                energy_value = (energy_tuple[0][target_spin_state[0]] + energy_tuple[0][target_spin_state[1]]) / 2
-            else:
-                with open(file_path, 'r') as file:
-                    for line in file:
-                        if "FINAL ENERGY:" in line:
-                            energy_value = float(line.split()[2])
-                            break
+            excited = self.toml.theory_level(state) == "excited"
         else:
             file_path = file_paths[state][substate_name]
-            terachem = TeraChemOutputReader(file_path)
-            if self.toml.theory_level(substate_name, substate = True) == "excited":
-                energy_tuple = terachem.ci_energy(max_roots)
-                energy_value = (energy_tuple[0][target_spin_state[0]] + energy_tuple[0][target_spin_state[1]]) / 2
-            else:
-                with open(file_path, 'r') as file:
-                    for line in file:
-                        if "FINAL ENERGY:" in line:
-                            energy_value = float(line.split()[2])
-                            break
+            excited = self.toml.theory_level(substate_name, substate = True) == "excited"
+
+        if excited:
+            # average over the (possibly identical) pair of target spin states
+            energy_value = self._output_energy(file_path, max_roots)[self.toml.target_spin_state(state)].mean()
+        else:
+            energy_value = self._output_energy(file_path)
+        self._energy_cache[key] = energy_value
         return energy_value
 
+    def _output_energy(self, file_path: str, max_roots: int = None) -> np.ndarray | float:
+        """Read the energies of a TeraChem output, using the cache file if it is up to date.
+
+        Args:
+            file_path (str): path of the TeraChem output
+            max_roots (int): default setting is None for the final energy, number of roots to extract CI energies from
+
+        Returns:
+            np.ndarray | float: CI energies or final energy (Eh)
+        """
+        version = _file_version(file_path)
+        if self.cache_file is None:
+            return self._read_energy(file_path, version, max_roots)
+
+        # one entry per output and number of roots, replaced when the output changes
+        entries = self._output_cache.setdefault(file_path, {})
+        entry = entries.get(str(max_roots))
+        if entry is None or entry["version"] != list(version):
+            energy = self._read_energy(file_path, version, max_roots)
+            entry = {"version": list(version), "energy": energy if max_roots is None else energy.tolist()}
+            entries[str(max_roots)] = entry
+        return entry["energy"] if max_roots is None else np.array(entry["energy"])
+
+    @staticmethod
+    def _read_energy(file_path: str, version: tuple[int, int], max_roots: int = None) -> np.ndarray | float:
+        """Read the energies of a version of a TeraChem output.
+
+        Args:
+            file_path (str): path of the TeraChem output
+            version (tuple[int, int]): version of the file from _file_version
+            max_roots (int): default setting is None for the final energy, number of roots to extract CI energies from
+
+        Returns:
+            np.ndarray | float: CI energies or final energy (Eh)
+        """
+        if max_roots is None:
+            return _read_final_energy(file_path, version)
+        return _read_ci_energy(file_path, version, max_roots)
+
+    def save_cache(self) -> None:
+        """Write the cached output energies to the cache file, if one is given.
+
+        The energies are written to a temporary file next to the cache file, which then replaces it.
+        An interrupted run therefore never leaves a partially written cache file behind.
+        """
+        if self.cache_file is None:
+            return
+        cache_dir = os.path.dirname(os.path.abspath(self.cache_file))
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".phokimo_cache_", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(self._output_cache, file)
+            os.replace(tmp_path, self.cache_file)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
     def state_relative_list_hartree(self) -> np.ndarray:
         """Generate an array of relative energies.
 
@@ -84,22 +213,35 @@ class State_Values:
         num_states = self.toml.len_states
         reference_state = self.toml.ref_name
         state_relative_list_energy = np.zeros(num_states)
+
+        # (state, substate) pairs of every output that has to be read
+        outputs = []
         for state in self.toml.name_to_num:
-            state_num = self.toml.state_num(state)
-            hartree_energy = 0.0
             if state == reference_state:
-                state_relative_list_energy[state_num] = 0.0
+                continue
+            if self.toml.substate_existence(state):
+                outputs.extend((state, substate) for substate in self.toml.substate_list(state))
             else:
-                if self.toml.substate_existence(state):
-                    for substate in self.toml.substate_list(state):
-                        hartree_energy += self.terachem_output(state, substate_name = substate)
-                else:
-                    hartree_energy = self.terachem_output(state)
-                if self.toml.theory_level(state) == "excited":
-                    reference_energy = self.terachem_output(reference_state)
-                else:
-                    reference_energy = self.terachem_output(reference_state, ground = True)
-                state_relative_list_energy[state_num] = hartree_energy - reference_energy
+                outputs.append((state, None))
+
+        hartree_energies = {state: 0.0 for state in self.toml.name_to_num if state != reference_state}
+        for state, substate in outputs:
+            hartree_energies[state] += self.terachem_output(state, substate_name = substate)
+
+        # reference energy of each state, read once per theory level
+        reference_energies = {}
+        state_reference_energies = np.empty(len(hartree_energies))
+        for idx, state in enumerate(hartree_energies):
+            theory_level = self.toml.theory_level(state)
+            if theory_level not in reference_energies:
+                ground = theory_level != "excited"
+                reference_energies[theory_level] = self.terachem_output(reference_state, ground = ground)
+            state_reference_energies[idx] = reference_energies[theory_level]
+
+        state_nums = [self.toml.state_num(state) for state in hartree_energies]
+
+        state_energies = np.fromiter(hartree_energies.values(), dtype=float, count=len(hartree_energies))
+        state_relative_list_energy[state_nums] = state_energies - state_reference_energies
         return state_relative_list_energy
 
     def state_relative_list_energy(self) -> np.ndarray:
@@ -108,8 +250,7 @@ class State_Values:
         Returns:
             np.ndarray: array of energies relative to reference state (J/mol)
         """
-        state_list_energy = energy_unit(self.hartree_array, "eh", "j/mol")
-        return state_list_energy
+        return self.hartree_array * HARTREE_TO_JMOL
 
 class Reactions:
     def __init__(self, toml, rate_constant, state_list_energy: np.ndarray):
@@ -125,8 +266,60 @@ class Reactions:
         self.toml = toml
         self.rate_constant = rate_constant
 
+        self.dim = (self.toml.len_states, self.toml.len_states)
+        self.total_atoms = float(self.toml.n_atoms)
+        # reciprocal of the vibrational degrees of freedom (3N - 6), fixed for the molecule
+        self.inv_vib_dof = 1.0 / (3 * self.total_atoms - 6)
+
+        self.ts_edges, self.relax_edges, self.relax_normal_modes = self.reaction_edges()
+        self.teq_edges = self.teq_group_edges()
         self.energy_differences = self.dEs(state_list_energy)
-    
+
+    def reaction_edges(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Collect the reactions as arrays of state numberings.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: transition reactions as rows of
+            (initial, final, transition state), vibrational relaxations as rows of (initial, final)
+            and the normal modes of the vibrational relaxations
+        """
+        ts_edges = []
+        relax_edges = []
+        relax_normal_modes = []
+        for init, fin in self.toml.reactions_name:
+            init_num = self.toml.state_num(init)
+            final_num = self.toml.state_num(fin)
+            # every edge is a given reaction, so its table is read directly
+            reaction = self.toml.finals[init][fin]
+            reaction_type = reaction["reaction_type"]
+            if reaction_type == "transition":
+                ts_edges.append((init_num, final_num, self.toml.state_num(reaction["ts"])))
+            elif reaction_type == "vibrational relaxation":
+                relax_edges.append((init_num, final_num))
+                relax_normal_modes.append(reaction["normal_mode"])
+        return (
+            np.array(ts_edges, dtype=np.int32).reshape(-1, 3),
+            np.array(relax_edges, dtype=np.int32).reshape(-1, 2),
+            np.array(relax_normal_modes, dtype=float),
+        )
+
+    def teq_group_edges(self) -> dict:
+        """Collect the reactions of each T_eq group as arrays of state numberings.
+
+        Reactions starting at the reactant itself are left out, they are computed at the non-equilibriated temperature.
+
+        Returns:
+            dict: map reactant to subsequent state of T_eq and subsequent state to rows of (initial, final)
+        """
+        teq_edges = {}
+        name_to_num = self.toml.name_to_num
+        for reactant, graph_teq_reactant in self.toml.teq_graph.items():
+            teq_edges[reactant] = {}
+            for temp_state, group in graph_teq_reactant.items():
+                edges = [(name_to_num[init], name_to_num[fin]) for init, fin in group if init != reactant]
+                teq_edges[reactant][temp_state] = np.array(edges, dtype=np.int32).reshape(-1, 2)
+        return teq_edges
+
     def dEs(self, state_list_energy: np.ndarray) -> np.ndarray:
         """Calculate the energy differences of each reaction.
 
@@ -139,21 +332,14 @@ class Reactions:
         Returns:
             np.ndarray: rate constant values in matrix form (k = dEs[initial state][final state])
         """
-        dim = (self.toml.len_states, self.toml.len_states)
-        dEs = np.zeros(dim)
-        
-        for init in self.toml.name_to_num:
-            init_num = self.toml.state_num(init)
-            for fin in self.toml.name_to_num:
-                final_num = self.toml.state_num(fin)
-                if self.toml.final_existence(init, fin):
-                    if self.toml.reaction_type(init, fin) == "transition":
-                        ts_num = self.toml.ts_num(init, fin)
-                        dE = state_list_energy[ts_num] - state_list_energy[init_num]
-                        dEs[init_num][final_num] = dE
-                    elif self.toml.reaction_type(init, fin) == "vibrational relaxation":
-                        dE = state_list_energy[final_num] - state_list_energy[init_num]
-                        dEs[init_num][final_num] = dE
+        dEs = np.zeros(self.dim)
+        energy = np.asarray(state_list_energy)
+
+        init_num, final_num, ts_num = self.ts_edges.T
+        dEs[init_num, final_num] = energy[ts_num] - energy[init_num]
+
+        init_num, final_num = self.relax_edges.T
+        dEs[init_num, final_num] = energy[final_num] - energy[init_num]
         return dEs
     
     def T_eq(self, state_list_energy: np.ndarray, reactant: str, temp_state: str) -> float:
@@ -172,54 +358,50 @@ class Reactions:
         Returns:
             np.ndarray: rate constant values in matrix form (k = dEs[initial state][final state])
         """
-        R_GAS = constants.R
-
-        total_atoms = self.toml.total_atoms()
         reactant_num = self.toml.state_num(reactant)
         temp_state_num = self.toml.state_num(temp_state)
 
-        return 300 + (state_list_energy[reactant_num] - state_list_energy[temp_state_num]) / ((3 * total_atoms - 6) * R_GAS)
+        return 300 + (state_list_energy[reactant_num] - state_list_energy[temp_state_num]) * self.inv_vib_dof * INV_R
 
     def rates(self, state_list_energy: np.ndarray) -> np.ndarray:
         """Calculate the rate constants of each reaction.
 
+        The matrix is kept in C order, since the ODE construction reads it row-wise by initial state.
+
         Args:
             state_list_energy (np.ndarray): energy(J/mol) of each state
 
         Returns:
-            np.ndarray: rate constants
+            np.ndarray: rate constants in matrix form (k = rates[initial state][final state])
         """
-        
-        graph_teq_group = self.toml.teq_graph
-        dim = (self.toml.len_states, self.toml.len_states)
-        rates = np.zeros(dim)
-        
-        reactants = self.toml.reactant_list_name()
+        rates = np.zeros(self.dim)
 
         dEs = self.dEs(state_list_energy)
 
-        total_atoms = float(self.toml.total_atoms())
-        
-        for reactant in reactants:
-            graph_teq_reactant = graph_teq_group[reactant]
-            for init in self.toml.name_to_num:
-                init_num = self.toml.state_num(init)
-                for fin in self.toml.name_to_num:
-                    final_num = self.toml.state_num(fin)
-                    if init == reactant:
-                        if self.toml.reaction_type(init, fin) == "vibrational relaxation":
-                            normal_mode = self.toml.normal_mode(init, fin)
-                            rate_constant = self.rate_constant.relaxation_theory.compute_rate(dEs[init_num][final_num], normal_mode, total_atoms, T = 300)
-                            rates[init_num][final_num] = rate_constant
-                    else:
-                        for temp_state in graph_teq_reactant:
-                            T_eq = self.T_eq(state_list_energy, reactant, temp_state)
-                            if (init, fin) in graph_teq_reactant.get(temp_state, []):
-                                if self.toml.reaction_type(init, fin) == "transition":
-                                    rate_constant = self.rate_constant.reaction_theory.compute_rate(dEs[init_num][final_num], T = T_eq)
-                                    rates[init_num][final_num] = rate_constant
-                                elif self.toml.reaction_type(init, fin) == "vibrational relaxation":
-                                    normal_mode = self.toml.normal_mode(init, fin)
-                                    rate_constant = self.rate_constant.relaxation_theory.compute_rate(dEs[init_num][final_num], normal_mode, total_atoms, T = T_eq)
-                                    rates[init_num][final_num] = rate_constant
+        # temperature of each reaction, NaN if no rate is assigned
+        # later reactants and T_eq groups overwrite earlier ones
+        temperatures = np.full(self.dim, np.nan)
+        relax_init, relax_final = self.relax_edges.T
+
+        for reactant, teq_edges_reactant in self.teq_edges.items():
+            reactant_num = self.toml.state_num(reactant)
+            temperatures[reactant_num, relax_final[relax_init == reactant_num]] = 300
+            for temp_state, edges in teq_edges_reactant.items():
+                temperatures[edges[:, 0], edges[:, 1]] = self.T_eq(state_list_energy, reactant, temp_state)
+
+        ts_init, ts_final, _ = self.ts_edges.T
+        T = temperatures[ts_init, ts_final]
+        assigned = ~np.isnan(T)
+        init_num, final_num = ts_init[assigned], ts_final[assigned]
+        rates[init_num, final_num] = self.rate_constant.reaction_theory.compute_rate(
+            dEs[init_num, final_num], T = T[assigned],
+        )
+
+        T = temperatures[relax_init, relax_final]
+        assigned = ~np.isnan(T)
+        init_num, final_num = relax_init[assigned], relax_final[assigned]
+        normal_modes = self.relax_normal_modes[assigned]
+        rates[init_num, final_num] = self.rate_constant.relaxation_theory.compute_rate(
+            dEs[init_num, final_num], normal_modes, self.total_atoms, T = T[assigned],
+        )
         return rates
\ No newline at end of file
@@ -3,11 +3,16 @@
 from __future__ import annotations
 
 import os
-import networkx as nx
+import sys
 from collections import defaultdict
+from functools import cached_property, lru_cache
 
 import numpy as np
-import toml
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
 
 
 class TomlReader:
@@ -25,44 +30,80 @@ class TomlReader:
         self.fpath = fpath
         assert fpath.endswith(".toml")
 
-        self.data = None
+        with open(self.fpath, "rb") as file:
+            self.data = tomllib.load(file)
 
-        with open(self.fpath) as file:
-            self.data = toml.load(file)
+        self.states = self.data["state"]
+        self.substates = self.data.get("substate", {})
+        self.molecule = self.data["molecule"]
+        self.finals = self.final_reaction_dict()
 
         self.calculation_dir = self.calculation_path()
+        self.folders = None
 
         self.len_states = self.num_states()
+        self.n_atoms = self.total_atoms()
+        self.n_normal_modes = self.total_normal_modes()
+        self.time_duration = self.duration()
 
         self.name_to_num = self.state_name_num_dict()
         self.reverse_name_to_num = self.reverse_state_name_num_dict()
         self.vis_name_list = self.visualize_state_list_name()
+        self.initial_concs = self.initial_conc()
         self.ref_name = self.reference_state()
 
+        self.conditions = self.state_condition_dict()
         self.reactant_names = self.reactant_list_name()
         self.reactant_nums = self.reactant_list_num()
         self.product_names = self.product_list_name()
         self.product_names_vis = self.visualize_product_list_name()
         self.product_nums = self.product_list_num()
 
+        self.state_spins = self.state_spin_dict()
         self.spins = self.spin_list()
         self.spin_dict = self.spin_list_dict()
 
         self.reactions_name = self.reaction_list_name()
         self.reactions_vis = self.reaction_list_visualize_name()
         self.reactions_num = self.reaction_list_num()
+        self.reactions_arr = self.reaction_array_num()
         
         self.graph_name = self.graph_table_name()
         self.graph_num = self.graph_table_num()
 
-        self.teq_graph = self.graph_teq_group()
-
         if 'substate' in self.data:
             self.sub_name_to_num = self.substate_name_num_dict()
             self.reverse_sub_name_to_num = self.reverse_substate_name_num_dict()
-        
-        if os.path.exists(self.calculation_path()):
-            self.file_path = self.file_path_dict()
+
+    @cached_property
+    def reaction_adjacency(self) -> dict:
+        """Adjacency of the reactions, built on first use.
+
+        Returns:
+            dict: map each initial state to the list of its final states
+        """
+        return self.reaction_graph()
+
+    @cached_property
+    def teq_graph(self) -> dict:
+        """Reactions grouped by equilibriated temperature, built on first use.
+
+        Returns:
+            dict: map reactant to parent state of T_eq and parent state to corresponding states as list items
+        """
+        return self.graph_teq_group()
+
+    @cached_property
+    def file_path(self) -> dict:
+        """File paths of the terachem outputs, built on first use.
+
+        The calculation directory only exists on the cluster, not where the mechanism diagram is drawn,
+        so it is only listed when the outputs are needed.
+
+        Returns:
+            dict: dict of file path except reference state
+        """
+        return self.file_path_dict()
 
     def total_atoms(self) -> int:
         """Extract the number of total atoms in toml file.
@@ -70,7 +111,7 @@ class TomlReader:
         Returns:
             int: number of total atoms
         """
-        return self.data["molecule"]["total_atoms"]
+        return self.molecule["total_atoms"]
 
     def total_normal_modes(self) -> int:
         """Calculate the normal modes from the number of total atoms.
@@ -81,7 +122,7 @@ class TomlReader:
         Returns:
             int: number of normal modes
         """
-        normal_modes = self._total_atoms() * 3 - 6
+        normal_modes = self.total_atoms() * 3 - 6
         return normal_modes
     
     def duration(self) -> float:
@@ -90,7 +131,7 @@ class TomlReader:
         Returns:
             float: duration of the modeling (s)
         """
-        return float(self.data["molecule"]["duration"]) * 10 ** (-15) #fs
+        return float(self.molecule["duration"]) * 1e-15 #fs
 
     def num_states(self) -> int:
         """Get the total number of states of the modeling.
@@ -98,7 +139,7 @@ class TomlReader:
         Returns:
             int: total number of states
         """
-        return len(self.data["state"])
+        return len(self.states)
 
     def mult(self, state: str, substate: bool = False) -> int:
         """Extract the spin multiplicity
@@ -113,9 +154,9 @@ class TomlReader:
             int: spin multiplicity
         """
         if substate:
-            return self.data["substate"][state]["spin_multiplicity"]
+            return self.substates[state]["spin_multiplicity"]
         else:
-            return self.data["state"][state]["spin_multiplicity"]
+            return self.states[state]["spin_multiplicity"]
 
     def target_spin_state(self, state: str, substate: bool = False) -> int:
         """Extract the target spin state.
@@ -128,11 +169,11 @@ class TomlReader:
             int: target spin state
         """
         if not substate:
-            spin_state = self.data["state"][state]["target_spin_state"]
+            spin_state = self.states[state]["target_spin_state"]
         else:
-            spin_state = self.data["substate"][state]["target_spin_state"]
+            spin_state = self.substates[state]["target_spin_state"]
             
-        if type(spin_state) == int:
+        if isinstance(spin_state, int):
             return [spin_state, spin_state]
         else:
             return spin_state
@@ -146,7 +187,15 @@ class TomlReader:
         Returns:
             str: state name for visualization
         """
-        return self.data["state"][state]["visualize_name"]
+        return self.states[state]["visualize_name"]
+
+    def final_reaction_dict(self) -> dict:
+        """Map each state to the reactions starting from it.
+
+        Returns:
+            dict: dictionary that maps state name and its table of final states, empty if it has no reaction
+        """
+        return {state: state_data.get("final", {}) for state, state_data in self.states.items()}
 
     def state_name_num_dict(self) -> dict:
         """Generate number label of each state as dictionary format.
@@ -154,26 +203,18 @@ class TomlReader:
         Returns:
             dict: dictionary that maps state name and number label
         """
-        name_num_dict = {}
-
-        counter = 0
-
-        for name in self.data['state']:
+        # names are compared in every lookup, interning lets equal names match by identity
+        return {sys.intern(name): num for num, name in enumerate(self.states)}
 
-            if name not in name_num_dict:
-                name_num_dict[name] = counter
-                counter += 1
-
-        return name_num_dict
-
-    def reverse_state_name_num_dict(self) -> dict:
+    def reverse_state_name_num_dict(self) -> tuple[str, ...]:
         """Reverse the name_to_num dict.
 
+        Number labels are given in order from 0, so the names are indexed by their number label.
+
         Returns:
-            dict: dictionary that connects number label to name
+            tuple[str, ...]: names of the states indexed by number label
         """
-        num_to_name = {num: name for name, num in self.name_to_num.items()}
-        return num_to_name
+        return tuple(self.name_to_num)
 
     def substate_name_num_dict(self) -> dict:
         """Generate number label of each state as dictionary format for substates.
@@ -184,25 +225,17 @@ class TomlReader:
         """
         assert 'substate' in self.data
 
-        name_num_dict = {}
-
-        counter = 0
-
-        for name in self.data["substate"]:
-            if name not in name_num_dict:
-                name_num_dict[name] = counter
-                counter += 1
-
-        return name_num_dict
+        return {name: num for num, name in enumerate(self.substates)}
 
-    def reverse_substate_name_num_dict(self) -> dict:
+    def reverse_substate_name_num_dict(self) -> tuple[str, ...]:
         """Reverse the name_to_num dict of substates.
 
+        Number labels are given in order from 0, so the names are indexed by their number label.
+
         Returns:
-            dict: dictionary that connects number label to name
+            tuple[str, ...]: names of the substates indexed by number label
         """
-        num_to_name = {num: name for name, num in self.sub_name_to_num.items()}
-        return num_to_name
+        return tuple(self.sub_name_to_num)
 
     def state_num(self, state: str) -> int:
         """Extract the numbering of the state.
@@ -224,7 +257,7 @@ class TomlReader:
         Returns:
             float: starting concentration
         """
-        return self.data["state"][state]["conc"]
+        return self.states[state]["conc"]
     
     def normal_mode(self, init: str, final: str) -> float:
         """Extract the normal mode of the reaction.
@@ -236,8 +269,8 @@ class TomlReader:
         Returns:
             float: corresponding normal mode of the reaction
         """
-        assert "final" in self.data["state"][init]
-        return self.data["state"][init]["final"][final]["normal_mode"]
+        assert "final" in self.states[init]
+        return self.finals[init][final]["normal_mode"]
     
     def substate_existence(self, state: str) -> bool:
         """Check substate exists or not.
@@ -248,10 +281,7 @@ class TomlReader:
         Returns:
             bool: True if substate exists and False for else
         """
-        if 'substate' in self.data["state"][state]:
-            return True
-        else:
-            return False
+        return "substate" in self.states[state]
         
     def substate_list(self, state: str) -> list:
         """Return list of substates.
@@ -266,7 +296,7 @@ class TomlReader:
         """
         assert self.substate_existence(state) 
 
-        return self.data["state"][state]["substate"]
+        return self.states[state]["substate"]
     
     def theory_level(self, state: str, substate: bool = False, ground: bool = False) -> str:
         """Return theory level of corresponding state.
@@ -279,16 +309,16 @@ class TomlReader:
         Returns:
             str: theory level (excited or ground)
         """
-        if state == self.reference_state():
+        if state == self.ref_name:
             if ground == False:
                 return "excited"
             else:
                 return "ground"
         else:
             if substate:
-                return self.data["substate"][state]["theory_level"]
+                return self.substates[state]["theory_level"]
             else:
-                return self.data["state"][state]["theory_level"]
+                return self.states[state]["theory_level"]
             
     def final_existence(self, init: str, fin: str) -> bool:
         """Check the existence of the reaction.
@@ -300,11 +330,7 @@ class TomlReader:
         Returns:
             bool: True if exists otherwise False
         """
-        if "final" in self.data["state"][init]:
-            if fin in self.data["state"][init]["final"]:
-                return True
-        else:
-            return False
+        return fin in self.finals[init]
 
     def final_name(self, init: str, fin: str) -> str:
         """Extract the name of the final state of a reaction.
@@ -349,7 +375,7 @@ class TomlReader:
             str: name of the transition state
         """
         assert self.reaction_type(init, fin) == "transition"
-        return self.data["state"][init]["final"][fin]["ts"]
+        return self.finals[init][fin]["ts"]
 
     def ts_num(self, init: str, fin: str) -> int:
         """Extract the numbering of the transition state.
@@ -363,7 +389,7 @@ class TomlReader:
         Returns:
             int: numbering of the transition state
         """
-        assert self.reaction_type(init, fin) == "transition"
+        # ts_name already checks the reaction type
         ts = self.ts_name(init, fin)
         return self.state_num(ts)
 
@@ -377,8 +403,7 @@ class TomlReader:
         Returns:
             tuple: edge connection of initial and final state of reaction (initial, final)
         """
-        edge = tuple([init, fin])
-        return edge
+        return (init, fin)
 
     def reaction_type(self, init: str, fin: str) -> str:
         """Check the reaction type of the reaction without transition state (relaxation).
@@ -390,8 +415,9 @@ class TomlReader:
         Returns:
             str: type of the reaction
         """
-        if self.final_existence(init, fin):
-            return self.data["state"][init]["final"][fin]["reaction_type"]
+        reaction = self.finals[init].get(fin)
+        if reaction is not None:
+            return reaction["reaction_type"]
         
     def calculation_path(self) -> str:
         """Get the calculation path of root directory.
@@ -399,7 +425,7 @@ class TomlReader:
         Returns:
             str: root directory of calculation directories
         """
-        return self.data["molecule"]["calculation_path"]
+        return self.molecule["calculation_path"]
 
     def file_path_dict(self) -> dict:
         """Generate a dictionary of file paths
@@ -411,28 +437,21 @@ class TomlReader:
             dict: dict of file path except reference state
         """
         file_path_dict = {}
-        
+
         for state in self.name_to_num:
-            sub_dict = {}
-            if "substate" in self.data["state"][state]:
-                for substate in self.data["state"][state]["substate"]:
-                    for folder in os.listdir(self.calculation_dir):
-                        folder_name = self.data["substate"][substate]["folder_name"]
-                        if folder.endswith(folder_name):
-                            if self.theory_level(state, substate = True) == "ground":
-                                sub_dict[substate] = os.path.join(self.calculation_dir, folder, "ground_sp", "tc.out")
-                            else:
-                                sub_dict[substate] = os.path.join(self.calculation_dir, folder, "sp", "tc.out")
-                    file_path_dict[state] = sub_dict
+            if "substate" in self.states[state]:
+                sub_dict = {}
+                for substate in self.states[state]["substate"]:
+                    folder = self.calculation_folder(self.substates[substate]["folder_name"])
+                    if folder is not None:
+                        ground = self.theory_level(substate, substate = True) == "ground"
+                        sub_dict[substate] = self.output_file_path(folder, ground)
+                file_path_dict[state] = sub_dict
             else:
-                folder_name = self.data["state"][state]["folder_name"]
-                for folder in os.listdir(self.calculation_dir):
-                    if folder.endswith(folder_name):
-                        if self.theory_level(state) == "ground":
-                            file_path = os.path.join(self.calculation_dir, folder, "ground_sp", "tc.out")
-                        else:
-                            file_path = os.path.join(self.calculation_dir, folder, "sp", "tc.out")
-                        file_path_dict[state] = file_path
+                folder = self.calculation_folder(self.states[state]["folder_name"])
+                if folder is not None:
+                    ground = self.theory_level(state) == "ground"
+                    file_path_dict[state] = self.output_file_path(folder, ground)
         return file_path_dict
 
     def ref_file_path(self, ground = False) -> str:
@@ -444,25 +463,49 @@ class TomlReader:
         Returns:
             str: directory of reference state output calculation file
         """
-        folder_name = self.data["state"][self.ref_name]["folder_name"]
-        for folder in os.listdir(self.calculation_dir):
+        folder = self.calculation_folder(self.states[self.ref_name]["folder_name"])
+        if folder is not None:
+            return self.output_file_path(folder, ground)
+
+    def calculation_folder(self, folder_name: str) -> str:
+        """Find the calculation folder whose name ends with the given folder name.
+
+        The calculation directory is listed only once and reused for every lookup.
+
+        Args:
+            folder_name (str): folder name given in the toml file
+
+        Returns:
+            str: name of the calculation folder, None if no folder matches
+        """
+        if self.folders is None:
+            with os.scandir(self.calculation_dir) as entries:
+                self.folders = [entry.name for entry in entries if entry.is_dir()]
+        for folder in self.folders:
             if folder.endswith(folder_name):
-                if ground:
-                    return os.path.join(self.calculation_dir, folder, "ground_sp", "tc.out")
-                else:
-                    return os.path.join(self.calculation_dir, folder, "sp", "tc.out")
-        
+                return folder
+
+    def output_file_path(self, folder: str, ground: bool = False) -> str:
+        """Get the path of the terachem output in a calculation folder.
+
+        Args:
+            folder (str): name of the calculation folder
+            ground (bool): default setting is excited, True when theory level is ground state calculation
+
+        Returns:
+            str: path of the terachem output
+        """
+        return os.path.join(self.calculation_dir, folder, "ground_sp" if ground else "sp", "tc.out")
+
     def initial_conc(self) -> np.ndarray:
         """Generate a list with initial concentration of each state.
 
+        States are numbered in the order of the toml file, so the values are read in that order.
+
         Returns:
             np.ndarray: initial concentration of each state
         """
-        start_conc = np.zeros(self.len_states)
-        for state in self.name_to_num:
-            state_num = self.state_num(state)
-            start_conc[state_num] = self.conc(state)
-        return start_conc
+        return np.fromiter((self.conc(state) for state in self.name_to_num), dtype=float, count=self.len_states)
     
     def visualize_state_list_name(self) -> list:
         """Generate a list with a name of each state for visualization.
@@ -470,11 +513,7 @@ class TomlReader:
         Returns:
             list: name of each state for visualization
         """
-        visualize_state_list_name = ["name"] * self.len_states
-        for state, num in self.name_to_num.items():
-            name = self.visualize_state_name(state)
-            visualize_state_list_name[num] = name
-        return visualize_state_list_name
+        return [self.visualize_state_name(state) for state in self.name_to_num]
     
     def reaction_list_name(self) -> list[tuple]:
         """Generate a list of reaction linkage.
@@ -485,11 +524,12 @@ class TomlReader:
             list: list of tuples of initial state(name) and final state(name) (initial, final)
         """
         reaction_list = []
-        for init in self.name_to_num:
-            for fin in self.name_to_num:
-                if self.final_existence(init, fin):
-                    edge = (init, fin)
-                    reaction_list.append(edge)
+        for init, reactions in self.finals.items():
+            # only the reactions that are given, kept in the order of the state numbering
+            finals = [fin for fin in reactions if fin in self.name_to_num]
+            for fin in sorted(finals, key=self.state_num):
+                edge = (sys.intern(init), sys.intern(fin))
+                reaction_list.append(edge)
         return reaction_list
 
     def reaction_list_visualize_name(self) -> list[tuple]:
@@ -515,12 +555,19 @@ class TomlReader:
         Returns:
             list: list of tuples of initial state(int) and final state(int) (initial, final)
         """
-        reaction_list_num = []
-        for edge in self.reactions_name:
-            init, fin = edge
-            num_edge = (self.state_num(init), self.state_num(fin))
-            reaction_list_num.append(num_edge)
-        return reaction_list_num
+        name_to_num = self.name_to_num
+        return [(name_to_num[init], name_to_num[fin]) for init, fin in self.reactions_name]
+
+    def reaction_array_num(self) -> tuple[np.ndarray, np.ndarray]:
+        """Generate the reaction linkage with numbering as arrays.
+
+        linkage of init(int) -> final(int), ignoring transition state
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: numbering of the initial states and of the final states of the reactions
+        """
+        reactions = np.array(self.reactions_num, dtype=np.int32).reshape(-1, 2)
+        return reactions[:, 0].copy(), reactions[:, 1].copy()
     
     def graph_table_name(self) -> list[tuple]:
         """Generate a list with reaction connection with state names.
@@ -529,15 +576,14 @@ class TomlReader:
             list: graph edge tuples that represent the reaction connections with state names
         """
         graph_table_name = []
-        for init in self.name_to_num:
-            for fin in self.name_to_num:
-                if self.final_existence(init, fin):
-                    if self.reaction_type(init, fin) == "transition":
-                        ts = self.ts_name(init, fin)
-                        graph_table_name.append(self.graph_edge(init, ts))
-                        graph_table_name.append(self.graph_edge(ts, fin))
-                    else:
-                        graph_table_name.append(self.graph_edge(init, fin))
+        for init, fin in self.reactions_name:
+            reaction = self.finals[init][fin]
+            if reaction["reaction_type"] == "transition":
+                ts = sys.intern(reaction["ts"])
+                graph_table_name.append(self.graph_edge(init, ts))
+                graph_table_name.append(self.graph_edge(ts, fin))
+            else:
+                graph_table_name.append(self.graph_edge(init, fin))
         return graph_table_name
 
     def graph_table_num(self) -> list:
@@ -546,15 +592,8 @@ class TomlReader:
         Returns:
             list: graph edge tuples that represent the reaction connections with state numberings
         """
-        graph_table_num = []
-        graph_table_name = self.graph_name
-
-        for edge in graph_table_name:
-            init, fin = edge
-            init_num = self.state_num(init)
-            fin_num = self.state_num(fin)
-            graph_table_num.append(self.graph_edge(init_num, fin_num))
-        return graph_table_num
+        name_to_num = self.name_to_num
+        return [(name_to_num[init], name_to_num[fin]) for init, fin in self.graph_name]
     
     def _condition(self, state = str) -> str:
         """Extract the condition of corresponding state.
@@ -565,7 +604,15 @@ class TomlReader:
         Returns:
             str: condition of each state (e.g. reactant, product, intermediate, etc)
         """
-        return self.data["state"][state]["condition"]
+        return self.states[state]["condition"]
+
+    def state_condition_dict(self) -> dict:
+        """Map each state to its condition.
+
+        Returns:
+            dict: dictionary that maps state name and condition
+        """
+        return {state: self._condition(state) for state in self.name_to_num}
     
     def reactant_list_name(self) -> list[str]: 
         """Extract the reactant names.
@@ -573,11 +620,7 @@ class TomlReader:
         Returns:
             list[str]: list of reactant names
         """
-        reactant_list_name = []
-        for state in self.name_to_num:
-            if self._condition(state) == "reactant":
-                reactant_list_name.append(state)
-        return reactant_list_name
+        return [state for state, condition in self.conditions.items() if condition == "reactant"]
             
     def reactant_list_num(self) -> list[int]:
         """Extract the numbering of the reactants.
@@ -593,11 +636,7 @@ class TomlReader:
         Returns:
             list[int]: list of name of the products
         """
-        product_list_name = []
-        for state in self.name_to_num:
-            if self._condition(state) == "product":
-                product_list_name.append(state)
-        return product_list_name
+        return [state for state, condition in self.conditions.items() if condition == "product"]
 
     def visualize_product_list_name(self) -> list[str]:
         """Generate a list of visualization name of the products.
@@ -605,12 +644,7 @@ class TomlReader:
         Returns:
             list[int]: list of the visualization name of the products
         """
-        product_list_name = []
-        for state in self.name_to_num:
-            if self._condition(state) == "product":
-                product_name = self.visualize_state_name(state)
-                product_list_name.append(product_name)
-        return product_list_name
+        return [self.visualize_state_name(state) for state in self.product_names]
 
     def product_list_num(self) -> list[int]:
         """Generate a list of numbering of the products.
@@ -626,10 +660,16 @@ class TomlReader:
         Returns:
             str: name of reference energy state
         """
-        for state in self.name_to_num:
-            if "reference_state" in self.data["state"][state]:
-                return state
+        return next((state for state, state_data in self.states.items() if "reference_state" in state_data), None)
             
+    def state_spin_dict(self) -> dict:
+        """Map each state to its spin.
+
+        Returns:
+            dict: dictionary that maps state name and (spin multiplicity, target spin state)
+        """
+        return {state: (self.mult(state), self.states[state]["target_spin_state"]) for state in self.name_to_num}
+
     def spin_list(self) -> list:
         """Get the list of existing spin states.
 
@@ -637,11 +677,10 @@ class TomlReader:
             list[tuple]: list of tuples that represents spin states as (spin, target) (e.g. S0 = (1, 0), S1 = (1, 1), and T2 = (3, 2))
         """
         spin_list = []
-        for state in self.name_to_num:
-            if type(self.data["state"][state]["target_spin_state"]) != list:
-                spin = (self.mult(state), self.target_spin_state(state)[0])
-                if spin not in spin_list:
-                    spin_list.append(spin)
+        for spin in self.state_spins.values():
+            # intersections have a pair of target spin states and are not counted as a spin state
+            if not isinstance(spin[1], list) and spin not in spin_list:
+                spin_list.append(spin)
         return spin_list
     
     def spin_list_dict(self) -> dict:
@@ -650,43 +689,81 @@ class TomlReader:
         Returns:
             dict: map spin (tuple) to corresponding states as list items
         """
-        spin_list_dict = {}
-        for spin in self.spins:
-            spin_states = []
-            mult, target = spin
-            for state in self.name_to_num:
-                if self.data["state"][state]["spin_multiplicity"] == mult and self.data["state"][state]["target_spin_state"] == target:
-                    spin_states.append(state)
-            spin_list_dict[spin] = spin_states
+        spin_list_dict = {spin: [] for spin in self.spins}
+        for state, spin in self.state_spins.items():
+            if not isinstance(spin[1], list):
+                spin_list_dict[spin].append(state)
         return spin_list_dict
     
+    def reaction_graph(self) -> dict:
+        """Build the adjacency of the reactions, ignoring the transition states.
+
+        Returns:
+            dict: map each initial state to the list of its final states
+        """
+        adjacency = defaultdict(list)
+        for init, fin in self.reactions_name:
+            adjacency[init].append(fin)
+        return dict(adjacency)
+
     def graph_teq_group(self) -> dict:
         """Group the reactions that has same equilibriated temperature.
 
         Returns:
             dict: map reactant to parent state of T_eq and parent state to corresponding states as list items
-        """       
-        def get_descendants(G, node):
-            descendants = []
-            for child in G.successors(node):
-                descendants.append((node, child))
-                descendants.extend(get_descendants(G, child))
-            return descendants
-        
+        """
+        adjacency = self.reaction_adjacency
+
         roots = self.reactant_names
         whole_groups = {}
 
         for root in roots:
-            G = nx.DiGraph()
-            edges = self.reactions_name
-            G.add_edges_from(edges)
-
             parent_groups = defaultdict(list)
-            direct_children = list(G.successors(root))
 
-            for parent in direct_children:
-                descendants = get_descendants(G, parent)
+            for parent in adjacency.get(root, ()):
+                # every reaction that can follow the parent state, each state is expanded once
+                descendants = []
+                visited = {parent}
+                stack = [parent]
+                while stack:
+                    node = stack.pop()
+                    for child in adjacency.get(node, ()):
+                        descendants.append((node, child))
+                        if child not in visited:
+                            visited.add(child)
+                            stack.append(child)
                 if descendants:
                     parent_groups[parent].extend(descendants)
             whole_groups[root] = parent_groups
         return whole_groups
+
+
+@lru_cache(maxsize=32)
+def _cached_reader(fpath: str, mtime_ns: int, size: int) -> TomlReader:  # noQA: ARG001
+    """Build a reader once per version of a toml file.
+
+    Args:
+        fpath (str): absolute file path of the toml file
+        mtime_ns (int): modification time of the file in ns, a changed file is read again
+        size (int): size of the file, catches changes within the timestamp resolution
+
+    Returns:
+        TomlReader: reader of the toml file
+    """
+    return TomlReader(fpath)
+
+
+def read_toml(fpath: str) -> TomlReader:
+    """Read a toml file once per path and version of the file.
+
+    The toml data is not modified after the reader is built, so the same reader is shared by every caller
+    until the file changes.
+
+    Args:
+        fpath (str): absolute file path of the toml file
+
+    Returns:
+        TomlReader: reader of the toml file
+    """
+    stat = os.stat(fpath)
+    return _cached_reader(os.path.abspath(fpath), stat.st_mtime_ns, stat.st_size)
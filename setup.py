@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-from setuptools import find_packages, setup
+from setuptools import setup
 
 setup(
     name="phokimo",
-    packages=find_packages(),
+    packages=["phokimo", "phokimo.mechanism", "phokimo.src", "phokimo.src.io"],
     entry_points={
         "console_scripts": ["phokimo = phokimo.__main__:main"],
     },